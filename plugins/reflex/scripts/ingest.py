@@ -14,9 +14,14 @@ Supported formats:
 - Code files (.py, .js, .ts, .go, .rs, .java, .c, .cpp, .rb, .sh)
 
 Usage:
-    uvx --with pymupdf,fastembed,qdrant-client,python-docx,ebooklib,beautifulsoup4 \
+    uvx --with pymupdf,fastembed,qdrant-client,python-docx,ebooklib,beautifulsoup4,lxml,orjson \
         python ingest.py <path> [--collection NAME] [--chunk-size WORDS]
 
+Optional packages (used when installed):
+    numba  - JIT-compiles chunk planning for large corpora
+    lxml   - faster HTML/EPUB parsing than the stdlib parser
+    orjson - faster Jupyter notebook parsing than the stdlib json module
+
 Examples:
     python ingest.py ~/Documents/manual.pdf
     python ingest.py ~/notes/ --collection research
@@ -24,15 +29,23 @@ Examples:
 """
 
 import argparse
+import asyncio
 import hashlib
 import json
+import mmap
+import multiprocessing
 import os
 import re
 import sys
-import time
+import warnings
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 
 # =============================================================================
@@ -70,14 +83,59 @@ class FileSizeError(IngestError):
 
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
 
+# Text files above this size are memory-mapped rather than read into a buffer
+MMAP_READ_THRESHOLD = 1_000_000  # 1MB
+
+# Embedding model and the vector name used by mcp-server-qdrant
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+VECTOR_NAME = "fast-all-minilm-l6-v2"
+
+EMBED_BATCH_SIZE = 64
+# ONNX Runtime threads for the in-process session; assumes 2-way SMT so
+# this approximates the number of physical cores
+EMBED_THREADS = max(1, (os.cpu_count() or 2) // 2)
+UPLOAD_BATCH_SIZE = 64
+# Concurrent upsert requests in flight; more gives no gain on a single client
+UPLOAD_CONCURRENCY = 2
+# Concurrent lookups when checking which files are already ingested
+LOOKUP_CONCURRENCY = 8
+
+# Indexing threshold (KB) restored after bulk ingest when the collection
+# reports none, or 0
+INDEXING_THRESHOLD = 20000
+# Below this many chunks, worker process startup outweighs parallel embedding
+EMBED_PARALLEL_MIN_CHUNKS = 512
+
+# Formats whose extraction costs far more per byte than reading plain text,
+# and how much more their size counts towards PARALLEL_MIN_BYTES
+HEAVY_FORMATS = frozenset({".pdf", ".epub", ".docx"})
+HEAVY_FORMAT_WEIGHT = 16
+# Below this much weighted input, extracting files serially beats starting
+# worker processes, each of which re-imports this script (~1.5s)
+PARALLEL_MIN_BYTES = 64 * 1024 * 1024
+
 
 # =============================================================================
 # Dependency imports with helpful error messages
 # =============================================================================
 
 try:
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import PointStruct, VectorParams, Distance
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import (
+        Batch,
+        Distance,
+        FieldCondition,
+        Filter,
+        FilterSelector,
+        MatchAny,
+        MatchValue,
+        OptimizersConfigDiff,
+        PayloadSchemaType,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+        VectorParams,
+    )
 except ImportError:
     raise DependencyError(
         "qdrant-client not installed. Run: pip install qdrant-client"
@@ -90,38 +148,108 @@ except ImportError:
         "fastembed not installed. Run: pip install fastembed"
     )
 
+try:
+    import numpy as np
+except ImportError:
+    raise DependencyError(
+        "numpy not installed. Run: pip install numpy"
+    )
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the chunk planner runs as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+# BeautifulSoup backend: lxml's C parser when installed, else the stdlib one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Notebook JSON: orjson parses straight from bytes when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# =============================================================================
+# File reading
+# =============================================================================
+
+@contextmanager
+def _mmap_bytes(path: Path) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Map a file read-only. Empty files cannot be mapped and yield b""."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 text file, decoding large files straight from a mapping."""
+    if path.stat().st_size <= MMAP_READ_THRESHOLD:
+        return path.read_text(encoding="utf-8", errors="ignore")
+
+    with _mmap_bytes(path) as mm:
+        text = str(mm, "utf-8", "ignore")
+
+    # Match read_text()'s universal newline handling
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
 
 # =============================================================================
 # Extractors for different file formats
 # =============================================================================
 
-def extract_pdf(path: Path) -> Tuple[str, Dict]:
-    """Extract text from PDF using PyMuPDF."""
+def extract_pdf_stream(doc: "fitz.Document") -> Iterator[str]:
+    """Yield the text of each non-empty page of an open PDF, then close it."""
+    try:
+        for page in doc:
+            text = page.get_text().strip()
+            if text:
+                yield text
+    finally:
+        doc.close()
+
+
+def extract_pdf(path: Path) -> Tuple[Iterator[str], Dict]:
+    """
+    Extract text from PDF using PyMuPDF.
+
+    Pages are returned as a stream, so the page texts are never joined
+    into one string.
+    """
     try:
         import fitz
     except ImportError:
         raise ExtractorError("pymupdf not installed. Run: pip install pymupdf")
 
+    # Open up front so unreadable files fail here, not mid-stream. The
+    # stream reuses this document and closes it when it finishes
     doc = fitz.open(str(path))
-    pages = []
-    for page in doc:
-        text = page.get_text().strip()
-        if text:
-            pages.append(text)
-    doc.close()
 
-    return "\n\n".join(pages), {"total_pages": len(pages), "format": "pdf"}
+    return extract_pdf_stream(doc), {"total_pages": doc.page_count, "format": "pdf"}
 
 
 def extract_markdown(path: Path) -> Tuple[str, Dict]:
     """Extract text from Markdown file."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
+    text = _read_text(path)
     return text, {"format": "markdown"}
 
 
 def extract_text(path: Path) -> Tuple[str, Dict]:
     """Extract text from plain text file."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
+    text = _read_text(path)
     return text, {"format": "text"}
 
 
@@ -132,8 +260,8 @@ def extract_html(path: Path) -> Tuple[str, Dict]:
     except ImportError:
         raise ExtractorError("beautifulsoup4 not installed. Run: pip install beautifulsoup4")
 
-    html = path.read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "html.parser")
+    html = _read_text(path)
+    soup = BeautifulSoup(html, HTML_PARSER)
 
     # Remove scripts, styles, nav, footer
     for tag in soup.find_all(["script", "style", "nav", "footer", "aside"]):
@@ -169,12 +297,17 @@ def extract_epub(path: Path) -> Tuple[str, Dict]:
 
     # Extract text from all documents
     chapters = []
-    for item in book.get_items():
-        if item.get_type() == ebooklib.ITEM_DOCUMENT:
-            soup = BeautifulSoup(item.get_content(), "html.parser")
-            text = soup.get_text(separator="\n", strip=True)
-            if text:
-                chapters.append(text)
+    with warnings.catch_warnings():
+        # Chapters are XHTML; lxml warns about parsing them as HTML
+        warnings.filterwarnings(
+            "ignore", message="It looks like you're using an HTML parser"
+        )
+        for item in book.get_items():
+            if item.get_type() == ebooklib.ITEM_DOCUMENT:
+                soup = BeautifulSoup(item.get_content(), HTML_PARSER)
+                text = soup.get_text(separator="\n", strip=True)
+                if text:
+                    chapters.append(text)
 
     return "\n\n".join(chapters), {
         "format": "epub",
@@ -211,7 +344,16 @@ def extract_docx(path: Path) -> Tuple[str, Dict]:
 
 def extract_notebook(path: Path) -> Tuple[str, Dict]:
     """Extract text from Jupyter notebook."""
-    content = json.loads(path.read_text(encoding="utf-8"))
+    content = None
+    if orjson is not None:
+        try:
+            content = orjson.loads(path.read_bytes())
+        except orjson.JSONDecodeError:
+            # orjson rejects the NaN/Infinity literals that json.dumps
+            # writes into outputs and widget state
+            pass
+    if content is None:
+        content = json.loads(path.read_text(encoding="utf-8"))
 
     cells = []
     code_cells = 0
@@ -389,34 +531,36 @@ def extract_mermaid_description(text: str) -> Optional[str]:
     return ' '.join(description_lines) if description_lines else None
 
 
+# Language by extension for code files
+CODE_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".rb": "ruby",
+    ".sh": "bash",
+    ".bash": "bash",
+    ".zsh": "zsh",
+    ".sql": "sql",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".toml": "toml",
+}
+
+
 def extract_code(path: Path) -> Tuple[str, Dict]:
     """Extract text from code file."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
+    text = _read_text(path)
 
     # Detect language from extension
-    ext_to_lang = {
-        ".py": "python",
-        ".js": "javascript",
-        ".ts": "typescript",
-        ".go": "go",
-        ".rs": "rust",
-        ".java": "java",
-        ".c": "c",
-        ".cpp": "cpp",
-        ".h": "c",
-        ".hpp": "cpp",
-        ".rb": "ruby",
-        ".sh": "bash",
-        ".bash": "bash",
-        ".zsh": "zsh",
-        ".sql": "sql",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".json": "json",
-        ".toml": "toml",
-    }
-
-    lang = ext_to_lang.get(path.suffix.lower(), "text")
+    lang = CODE_LANGUAGES.get(path.suffix.lower(), "text")
 
     return text, {"format": "code", "language": lang}
 
@@ -459,13 +603,51 @@ EXTRACTORS = {
 }
 
 
+# Frozen copy of the extension keys for the per-file support checks
+_SUPPORTED_EXTS = frozenset(EXTRACTORS)
+
+
 def is_supported(path: Path) -> bool:
     """Check if file format is supported."""
-    return path.suffix.lower() in EXTRACTORS
+    return path.suffix.lower() in _SUPPORTED_EXTS
 
 
-def extract(path: Path) -> Tuple[str, Dict]:
-    """Extract text from file based on extension."""
+def _iter_supported(root: Path, recursive: bool) -> Iterator[Path]:
+    """
+    Yield supported files in a directory, optionally descending into subdirectories.
+
+    Walks with os.scandir so file types come from the directory entries
+    without extra stat calls, and only wraps matching files in a Path.
+    Symlinked directories are not followed.
+    """
+    supported = _SUPPORTED_EXTS
+    splitext = os.path.splitext
+    pending = deque([str(root)])
+    while pending:
+        directory = pending.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif (
+                        splitext(entry.name)[1].lower() in supported
+                        and entry.is_file()
+                    ):
+                        yield Path(entry.path)
+        except OSError as e:
+            print(f"  Warning: Cannot read {directory}: {e}")
+
+
+def extract(path: Path) -> Tuple[Union[str, Iterable[str]], Dict]:
+    """
+    Extract text from file based on extension.
+
+    Returns:
+        Tuple of (text, metadata). Text is a string, or an iterable of
+        segments for formats that stream, such as PDF pages.
+    """
     ext = path.suffix.lower()
     extractor = EXTRACTORS.get(ext)
 
@@ -479,158 +661,230 @@ def extract(path: Path) -> Tuple[str, Dict]:
 # Chunking
 # =============================================================================
 
-def chunk_text(
-    text: str,
-    chunk_size: int = 400,
-    overlap: int = 50
-) -> List[Dict]:
+# Blank lines separate paragraphs
+_PARA_RE = re.compile(r'\n\s*\n')
+
+
+def _word_counts(paragraphs: List[str]) -> np.ndarray:
     """
-    Chunk text into overlapping segments.
+    Count whitespace-separated words in each paragraph.
 
-    Args:
-        text: Full text to chunk
-        chunk_size: Target words per chunk
-        overlap: Words to overlap between chunks
+    Returns:
+        Array of word counts, one per paragraph
+    """
+    return np.fromiter(
+        (len(p.split()) for p in paragraphs),
+        dtype=np.int64,
+        count=len(paragraphs)
+    )
+
+
+@njit(cache=True)
+def _chunk_indices(
+    word_counts: np.ndarray,
+    chunk_size: int,
+    overlap: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Plan chunk boundaries from paragraph word counts.
+
+    Compiled with numba when it is installed.
 
     Returns:
-        List of chunk dicts with content and word_count
+        Tuple of (start, end, word_count) arrays, where chunk i spans
+        paragraphs[start[i]:end[i]]
     """
-    # Split into paragraphs
-    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
+    n = word_counts.shape[0]
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    totals = np.empty(n, dtype=np.int64)
+    count = 0
 
-    chunks = []
-    current = []
+    start = 0
     current_words = 0
+    for i in range(n):
+        para_words = word_counts[i]
 
-    for para in paragraphs:
-        para_words = len(para.split())
-
-        # If adding this paragraph exceeds limit, save current chunk
-        if current_words + para_words > chunk_size and current:
-            chunks.append({
-                "content": "\n\n".join(current),
-                "word_count": current_words
-            })
+        # If adding this paragraph exceeds limit, close the current chunk
+        if current_words + para_words > chunk_size and i > start:
+            starts[count] = start
+            ends[count] = i
+            totals[count] = current_words
+            count += 1
 
             # Keep last paragraph for overlap
-            if current and len(current[-1].split()) <= overlap:
-                current = [current[-1]]
-                current_words = len(current[-1].split())
+            if word_counts[i - 1] <= overlap:
+                start = i - 1
+                current_words = word_counts[i - 1]
             else:
-                current = []
+                start = i
                 current_words = 0
 
-        current.append(para)
         current_words += para_words
 
     # Don't forget last chunk
-    if current:
-        chunks.append({
-            "content": "\n\n".join(current),
-            "word_count": current_words
-        })
+    if n > start:
+        starts[count] = start
+        ends[count] = n
+        totals[count] = current_words
+        count += 1
 
-    return chunks
+    return starts[:count], ends[:count], totals[:count]
+
+
+def split_paragraphs(text: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Split text into non-empty paragraphs.
+
+    Args:
+        text: Full text, or an iterable of segments (e.g. PDF pages) that
+            is consumed one segment at a time. Segment boundaries are
+            treated as paragraph breaks.
+
+    Returns:
+        List of stripped paragraphs
+    """
+    segments = [text] if isinstance(text, str) else text
+    return [
+        p
+        for segment in segments
+        for p in map(str.strip, _PARA_RE.split(segment))
+        if p
+    ]
+
+
+def chunk_paragraphs(
+    paragraphs: List[str],
+    word_counts: np.ndarray,
+    chunk_size: int = 400,
+    overlap: int = 50
+) -> List[Dict]:
+    """
+    Chunk paragraphs into overlapping segments.
+
+    Args:
+        paragraphs: Paragraphs from split_paragraphs()
+        word_counts: Word count of each paragraph, from _word_counts()
+        chunk_size: Target words per chunk
+        overlap: Words to overlap between chunks
+
+    Returns:
+        List of chunk dicts with content and word_count
+    """
+    starts, ends, totals = _chunk_indices(word_counts, chunk_size, overlap)
+
+    return [
+        {
+            "content": "\n\n".join(paragraphs[start:end]),
+            "word_count": words
+        }
+        for start, end, words in zip(starts.tolist(), ends.tolist(), totals.tolist())
+    ]
 
 
 # =============================================================================
 # Qdrant ingestion
 # =============================================================================
 
-def connect_to_qdrant(
+async def connect_to_qdrant(
     qdrant_url: str,
+    grpc_port: Optional[int] = 6334,
     max_retries: int = 3,
     retry_delay: float = 2.0
-) -> QdrantClient:
+) -> AsyncQdrantClient:
     """
     Connect to Qdrant with retry logic.
 
     Args:
         qdrant_url: Qdrant server URL
+        grpc_port: Qdrant gRPC port, or None to use the HTTP API. gRPC
+            sends vectors as packed binary floats rather than JSON
         max_retries: Maximum number of connection attempts
         retry_delay: Seconds to wait between retries
 
     Returns:
-        Connected QdrantClient
+        Connected AsyncQdrantClient
 
     Raises:
         QdrantConnectionError: If all connection attempts fail
     """
     last_error = None
+    if grpc_port is None:
+        target = qdrant_url
+    else:
+        target = f"{qdrant_url} (gRPC port {grpc_port})"
 
     for attempt in range(1, max_retries + 1):
+        client = None
         try:
-            client = QdrantClient(url=qdrant_url, timeout=10)
+            if grpc_port is None:
+                client = AsyncQdrantClient(url=qdrant_url, timeout=10)
+            else:
+                client = AsyncQdrantClient(
+                    url=qdrant_url,
+                    grpc_port=grpc_port,
+                    prefer_grpc=True,
+                    timeout=10
+                )
             # Test connection by listing collections
-            client.get_collections()
+            await client.get_collections()
             return client
         except Exception as e:
             last_error = e
+            if client is not None:
+                await client.close()
             if attempt < max_retries:
                 print(f"  Connection attempt {attempt}/{max_retries} failed: {e}")
                 print(f"  Retrying in {retry_delay}s...")
-                time.sleep(retry_delay)
+                await asyncio.sleep(retry_delay)
             else:
+                hint = "" if grpc_port is None else (
+                    ". If the server only exposes HTTP, rerun with --no-grpc"
+                )
                 raise QdrantConnectionError(
-                    f"Failed to connect to Qdrant at {qdrant_url} after {max_retries} attempts: {last_error}"
+                    f"Failed to connect to Qdrant at {target} after {max_retries} attempts: {last_error}{hint}"
                 )
 
     # Should not reach here, but just in case
     raise QdrantConnectionError(f"Failed to connect to Qdrant: {last_error}")
 
 
-def ingest_to_qdrant(
+def compute_file_hash(path: Path) -> str:
+    """
+    Hash file contents for deduplication.
+
+    Point IDs are derived from this hash, so it stays MD5: changing the
+    algorithm would give every stored chunk a new ID and duplicate it on
+    the next run.
+    """
+    with _mmap_bytes(path) as mm:
+        return hashlib.md5(mm).hexdigest()[:12]
+
+
+def prepare_chunks(
     chunks: List[Dict],
     file_path: Path,
     file_metadata: Dict,
-    collection: str,
-    qdrant_url: str = "http://localhost:6333"
-) -> int:
+    file_hash: str,
+    chunk_size: int
+) -> List[Dict]:
     """
-    Ingest chunks into Qdrant.
+    Attach point IDs and payload metadata to a file's chunks.
 
     Args:
         chunks: List of chunk dicts
         file_path: Original file path
         file_metadata: Metadata from extraction
-        collection: Qdrant collection name
-        qdrant_url: Qdrant server URL
+        file_hash: Hash of the file contents, from compute_file_hash()
+        chunk_size: Target words per chunk the file was split with
 
     Returns:
-        Number of chunks ingested
-
-    Raises:
-        QdrantConnectionError: If connection to Qdrant fails
+        List of dicts with id, document and metadata, ready for embedding
     """
-    # Initialize clients with retry
-    client = connect_to_qdrant(qdrant_url)
-    embedder = TextEmbedding("sentence-transformers/all-MiniLM-L6-v2")
-
-    # Vector name used by mcp-server-qdrant
-    vector_name = "fast-all-minilm-l6-v2"
-
-    # Ensure collection exists
-    collections = [c.name for c in client.get_collections().collections]
-    if collection not in collections:
-        client.create_collection(
-            collection_name=collection,
-            vectors_config={
-                vector_name: VectorParams(size=384, distance=Distance.COSINE)
-            }
-        )
-        print(f"Created collection: {collection}")
-
-    # Prepare points
-    points = []
-    contents = [c["content"] for c in chunks]
-
-    print(f"Generating embeddings for {len(chunks)} chunks...")
-    embeddings = list(embedder.embed(contents))
-
-    # Generate file hash for deduplication
-    file_hash = hashlib.md5(file_path.read_bytes()).hexdigest()[:12]
+    harvested_at = datetime.now().isoformat()
 
-    for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+    prepared = []
+    for i, chunk in enumerate(chunks):
         # Create unique ID from file hash + chunk index
         point_id = hashlib.md5(f"{file_hash}_{i}".encode()).hexdigest()
 
@@ -640,31 +894,349 @@ def ingest_to_qdrant(
             "content_type": file_metadata.get("format", "text"),
             "original_path": str(file_path.absolute()),
             "filename": file_path.name,
-            "harvested_at": datetime.now().isoformat(),
+            "harvested_at": harvested_at,
+            "file_hash": file_hash,
             "chunk_index": i,
             "total_chunks": len(chunks),
+            "chunk_size": chunk_size,
             "word_count": chunk["word_count"],
             **{k: v for k, v in file_metadata.items() if v is not None}
         }
 
-        # Use named vector to match mcp-server-qdrant format
-        points.append(PointStruct(
-            id=point_id,
-            vector={vector_name: embedding.tolist()},
-            payload={
-                "document": chunk["content"],
-                "metadata": metadata
-            }
+        prepared.append({
+            "id": point_id,
+            "document": chunk["content"],
+            "metadata": metadata
+        })
+
+    return prepared
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+@lru_cache(maxsize=None)
+def _get_embedder() -> TextEmbedding:
+    """
+    Load the embedding model once and share it for the rest of the run.
+
+    The ONNX session is created lazily, so a run whose chunks all go to
+    fastembed's parallel workers (one thread each) never loads it here.
+    """
+    return TextEmbedding(EMBEDDING_MODEL, threads=EMBED_THREADS, lazy_load=True)
+
+
+async def _ensure_collection(client: AsyncQdrantClient, collection: str) -> None:
+    """
+    Create the collection if it does not exist yet.
+
+    New collections keep full-precision vectors on disk and an int8
+    quantized copy in RAM for search, cutting resident vector memory ~4x.
+    """
+    if not await client.collection_exists(collection):
+        await client.create_collection(
+            collection_name=collection,
+            vectors_config={
+                VECTOR_NAME: VectorParams(
+                    size=384,
+                    distance=Distance.COSINE,
+                    on_disk=True
+                )
+            },
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
+                )
+            )
+        )
+        print(f"Created collection: {collection}")
+
+    # Index file hashes so already-ingested files can be looked up cheaply
+    await client.create_payload_index(
+        collection_name=collection,
+        field_name="metadata.file_hash",
+        field_schema=PayloadSchemaType.KEYWORD
+    )
+
+
+async def _find_ingested(
+    client: AsyncQdrantClient,
+    collection: str,
+    prepared: List[Dict]
+) -> Set[str]:
+    """
+    Find files whose chunks are all already stored in the collection.
+
+    Only points chunked with the same chunk size count, so re-running with
+    a different --chunk-size re-ingests the file.
+
+    Returns:
+        File hashes with at least as many stored points as chunks
+    """
+    expected = {
+        p["metadata"]["file_hash"]: (
+            p["metadata"]["total_chunks"],
+            p["metadata"]["chunk_size"]
+        )
+        for p in prepared
+    }
+    semaphore = asyncio.Semaphore(LOOKUP_CONCURRENCY)
+
+    async def stored(file_hash: str, chunk_size: int) -> int:
+        async with semaphore:
+            response = await client.count(
+                collection_name=collection,
+                count_filter=Filter(must=[
+                    FieldCondition(
+                        key="metadata.file_hash",
+                        match=MatchValue(value=file_hash)
+                    ),
+                    FieldCondition(
+                        key="metadata.chunk_size",
+                        match=MatchValue(value=chunk_size)
+                    )
+                ]),
+                exact=True
+            )
+            return response.count
+
+    counts = await asyncio.gather(*(
+        stored(file_hash, chunk_size)
+        for file_hash, (_, chunk_size) in expected.items()
+    ))
+    return {
+        file_hash
+        for (file_hash, (total, _)), count in zip(expected.items(), counts)
+        if count >= total
+    }
+
+
+async def _delete_stale(
+    client: AsyncQdrantClient,
+    collection: str,
+    prepared: List[Dict]
+) -> None:
+    """
+    Delete points left from uploading these files at another chunk size.
+
+    Point IDs only depend on the file hash and chunk index, so a file
+    re-chunked into fewer chunks would otherwise keep its old tail.
+    """
+    chunk_size = prepared[0]["metadata"]["chunk_size"]
+    file_hashes = list({p["metadata"]["file_hash"] for p in prepared})
+
+    await client.delete(
+        collection_name=collection,
+        points_selector=FilterSelector(filter=Filter(
+            must=[
+                FieldCondition(
+                    key="metadata.file_hash",
+                    match=MatchAny(any=file_hashes)
+                )
+            ],
+            must_not=[
+                FieldCondition(
+                    key="metadata.chunk_size",
+                    match=MatchValue(value=chunk_size)
+                )
+            ]
         ))
+    )
 
-    # Upsert in batches
-    batch_size = 100
-    for i in range(0, len(points), batch_size):
-        batch = points[i:i + batch_size]
-        client.upsert(collection_name=collection, points=batch)
-        print(f"  Ingested {min(i + batch_size, len(points))}/{len(points)} chunks")
 
-    return len(points)
+async def ingest_to_qdrant(
+    prepared: List[Dict],
+    collection: str,
+    qdrant_url: str = "http://localhost:6333",
+    grpc_port: Optional[int] = 6334
+) -> Set[str]:
+    """
+    Embed prepared chunks from all files and ingest them into Qdrant.
+
+    All chunks go through a single streaming embed() call so the model
+    and its workers are set up once per run rather than once per file.
+    Files already fully stored in the collection are skipped.
+
+    Args:
+        prepared: Chunks from prepare_chunks(), across all files
+        collection: Qdrant collection name
+        qdrant_url: Qdrant server URL
+        grpc_port: Qdrant gRPC port, or None to use the HTTP API
+
+    Returns:
+        Hashes of files skipped because they were already ingested
+
+    Raises:
+        QdrantConnectionError: If connection to Qdrant fails
+    """
+    # Initialize client with retry
+    client = await connect_to_qdrant(qdrant_url, grpc_port=grpc_port)
+
+    try:
+        await _ensure_collection(client, collection)
+
+        # Skip files whose chunks are all stored already
+        skipped = await _find_ingested(client, collection, prepared)
+        if skipped:
+            # Count files rather than hashes, as identical files share one
+            skipped_files = {
+                p["metadata"]["original_path"]
+                for p in prepared
+                if p["metadata"]["file_hash"] in skipped
+            }
+            print(f"Skipping {len(skipped_files)} unchanged file(s) already in {collection}")
+            prepared = [
+                p for p in prepared
+                if p["metadata"]["file_hash"] not in skipped
+            ]
+        if not prepared:
+            return skipped
+
+        await _delete_stale(client, collection, prepared)
+
+        # Disable HNSW indexing during the load, keeping the collection's
+        # own threshold to restore afterwards
+        info = await client.get_collection(collection)
+        threshold = info.config.optimizer_config.indexing_threshold
+        if not threshold:
+            # A stored 0 is taken to be left over from an interrupted or
+            # concurrent ingest, not a setting to keep
+            threshold = INDEXING_THRESHOLD
+        await client.update_collection(
+            collection_name=collection,
+            optimizer_config=OptimizersConfigDiff(indexing_threshold=0)
+        )
+
+        try:
+            await _upload_chunks(client, prepared, collection)
+            return skipped
+        finally:
+            # Re-enable indexing so HNSW is built in a single pass over the
+            # whole run rather than rebuilt as each batch arrives
+            await client.update_collection(
+                collection_name=collection,
+                optimizer_config=OptimizersConfigDiff(
+                    indexing_threshold=threshold
+                )
+            )
+    finally:
+        await client.close()
+
+
+def _embed_unique(documents: List[str]) -> Iterator[np.ndarray]:
+    """
+    Embed documents, running the model once per distinct text.
+
+    Yields one embedding per document, in order. A repeated text reuses
+    the vector of its first occurrence, which is kept only until its
+    last copy has been yielded.
+    """
+    remaining = Counter(documents)
+    unique = list(remaining)
+
+    print(f"Generating embeddings for {len(documents)} chunks ({len(unique)} unique)...")
+    parallel = os.cpu_count() if len(unique) >= EMBED_PARALLEL_MIN_CHUNKS else None
+    embeddings = iter(_get_embedder().embed(
+        unique,
+        batch_size=EMBED_BATCH_SIZE,
+        parallel=parallel
+    ))
+
+    repeated = {}
+    for document in documents:
+        embedding = repeated.pop(document, None)
+        if embedding is None:
+            embedding = next(embeddings)
+        remaining[document] -= 1
+        if remaining[document]:
+            repeated[document] = embedding
+        yield embedding
+
+
+def _to_batch(items: List[Tuple[Dict, np.ndarray]]) -> Batch:
+    """
+    Build a columnar upsert batch from (prepared chunk, embedding) pairs.
+
+    qdrant-client validates vectors as lists of floats and converts numpy
+    arrays element by element, so the batch's vectors are stacked and
+    converted with a single tolist() call instead.
+    """
+    vectors = np.stack([embedding for _, embedding in items]).astype(np.float32, copy=False)
+
+    # Use named vector to match mcp-server-qdrant format
+    return Batch(
+        ids=[p["id"] for p, _ in items],
+        vectors={VECTOR_NAME: vectors.tolist()},
+        payloads=[
+            {"document": p["document"], "metadata": p["metadata"]}
+            for p, _ in items
+        ]
+    )
+
+
+async def _upload_chunks(
+    client: AsyncQdrantClient,
+    prepared: List[Dict],
+    collection: str
+) -> int:
+    """Embed prepared chunks and stream them into a collection."""
+    embeddings = _embed_unique([p["document"] for p in prepared])
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    ingested = 0
+
+    async def upsert(batch: Batch) -> None:
+        nonlocal ingested
+        try:
+            await client.upsert(
+                collection_name=collection,
+                points=batch,
+                wait=False
+            )
+            ingested += len(batch.ids)
+            print(f"  Ingested {ingested}/{len(prepared)} chunks")
+        finally:
+            semaphore.release()
+
+    batches = _batched(zip(prepared, embeddings), UPLOAD_BATCH_SIZE)
+
+    def next_batch() -> Optional[Batch]:
+        items = next(batches, None)
+        return _to_batch(items) if items is not None else None
+
+    # Pipeline embedding and upload: the next batch is embedded on a worker
+    # thread (ONNX Runtime releases the GIL) while earlier batches upsert,
+    # and it waits for a free upload slot before it is sent
+    tasks: Set[asyncio.Task] = set()
+    try:
+        while True:
+            batch = await asyncio.to_thread(next_batch)
+            if batch is None:
+                break
+            await semaphore.acquire()
+            # Stop at the first failed upsert instead of embedding the rest
+            for task in [t for t in tasks if t.done()]:
+                tasks.discard(task)
+                task.result()
+            tasks.add(asyncio.create_task(upsert(batch)))
+        await asyncio.gather(*tasks)
+    finally:
+        # On failure, cancel the upserts still in flight and collect their
+        # outcomes so none is left unretrieved
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return ingested
 
 
 # =============================================================================
@@ -673,14 +1245,18 @@ def ingest_to_qdrant(
 
 def process_file(
     path: Path,
-    collection: str,
     chunk_size: int,
-    qdrant_url: str,
     max_file_size: int = MAX_FILE_SIZE
-) -> Dict:
-    """Process a single file."""
-    print(f"\nProcessing: {path.name}")
+) -> Tuple[Dict, List[Dict]]:
+    """
+    Extract and chunk a single file.
+
+    Runs in a worker process when several files are ingested, so progress
+    is reported by the caller rather than printed here.
 
+    Returns:
+        Tuple of (result dict, prepared chunks awaiting embedding)
+    """
     # Check file size
     file_size = path.stat().st_size
     if file_size > max_file_size:
@@ -690,32 +1266,66 @@ def process_file(
             f"File size ({size_mb:.1f}MB) exceeds limit ({limit_mb:.0f}MB)"
         )
 
-    # Extract text
+    # Extract text, streaming it into paragraphs where the format allows
     text, metadata = extract(path)
+    paragraphs = split_paragraphs(text)
 
-    if not text.strip():
-        print(f"  Warning: No text extracted from {path.name}")
-        return {"file": str(path), "status": "empty", "chunks": 0}
+    if not paragraphs:
+        return {"file": str(path), "status": "empty", "chunks": 0}, []
 
     # Chunk
-    chunks = chunk_text(text, chunk_size=chunk_size)
-    print(f"  Extracted {len(text.split())} words -> {len(chunks)} chunks")
-
-    # Ingest
-    ingested = ingest_to_qdrant(
-        chunks=chunks,
+    word_counts = _word_counts(paragraphs)
+    chunks = chunk_paragraphs(paragraphs, word_counts, chunk_size=chunk_size)
+    content_hash = compute_file_hash(path)
+    prepared = prepare_chunks(
+        chunks,
         file_path=path,
         file_metadata=metadata,
-        collection=collection,
-        qdrant_url=qdrant_url
+        file_hash=content_hash,
+        chunk_size=chunk_size
     )
 
     return {
         "file": str(path),
         "status": "success",
-        "chunks": ingested,
+        "chunks": len(prepared),
+        "file_hash": content_hash,
+        "words": int(word_counts.sum()),
         "format": metadata.get("format", "unknown")
-    }
+    }, prepared
+
+
+def _file_executor(files: List[Path]) -> Executor:
+    """
+    Create an executor for process_file().
+
+    Extraction is CPU-bound, so enough input is spread over worker
+    processes. A single file, or a few small ones, runs on one thread in
+    this process instead, skipping worker startup.
+    """
+    work = 0
+    for path in files:
+        try:
+            size = path.stat().st_size
+        except OSError:
+            # process_file() reports the error
+            continue
+        if path.suffix.lower() in HEAVY_FORMATS:
+            size *= HEAVY_FORMAT_WEIGHT
+        work += size
+
+    if len(files) <= 1 or work < PARALLEL_MIN_BYTES:
+        return ThreadPoolExecutor(max_workers=1)
+
+    # forkserver workers start clean rather than copying this process
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+    return ProcessPoolExecutor(
+        max_workers=min(len(files), os.cpu_count() or 1),
+        mp_context=context
+    )
 
 
 def main():
@@ -743,6 +1353,17 @@ def main():
         default=os.environ.get("QDRANT_URL", "http://localhost:6333"),
         help="Qdrant server URL (default: http://localhost:6333)"
     )
+    parser.add_argument(
+        "--grpc-port",
+        type=int,
+        default=int(os.environ.get("QDRANT_GRPC_PORT", 6334)),
+        help="Qdrant gRPC port (default: 6334, or QDRANT_GRPC_PORT env var)"
+    )
+    parser.add_argument(
+        "--no-grpc",
+        action="store_true",
+        help="Use the HTTP API instead of gRPC"
+    )
     parser.add_argument(
         "--recursive",
         action="store_true",
@@ -769,10 +1390,7 @@ def main():
             print(f"Unsupported format: {args.path.suffix}")
             sys.exit(1)
     elif args.path.is_dir():
-        pattern = "**/*" if args.recursive else "*"
-        for p in args.path.glob(pattern):
-            if p.is_file() and is_supported(p):
-                files.append(p)
+        files.extend(_iter_supported(args.path, recursive=args.recursive))
 
         if not files:
             print(f"No supported files found in {args.path}")
@@ -785,57 +1403,87 @@ def main():
     print(f"Collection: {args.collection}")
     print(f"Chunk size: {args.chunk_size} words")
 
-    # Process files
+    # Extract and chunk files, in parallel when there is enough input, and
+    # report in discovery order
     results = []
-    for path in files:
+    pending = []
+    with _file_executor(files) as executor:
+        futures = [
+            executor.submit(process_file, path, args.chunk_size, max_file_size)
+            for path in files
+        ]
+        for path, future in zip(files, futures):
+            print(f"\nProcessing: {path.name}")
+            try:
+                result, prepared = future.result()
+                if result["status"] == "empty":
+                    print(f"  Warning: No text extracted from {path.name}")
+                else:
+                    print(f"  Extracted {result['words']} words -> {result['chunks']} chunks")
+                results.append(result)
+                pending.extend(prepared)
+            except FileSizeError as e:
+                # File too large - skip with warning
+                print(f"  Skipped: {e}")
+                results.append({
+                    "file": str(path),
+                    "status": "skipped",
+                    "error": str(e)
+                })
+            except (ExtractorError, IngestError) as e:
+                # Extraction/ingestion errors - log and continue
+                print(f"  Error: {e}")
+                results.append({
+                    "file": str(path),
+                    "status": "error",
+                    "error": str(e)
+                })
+            except Exception as e:
+                # Unexpected errors - log with details and continue
+                print(f"  Unexpected error: {type(e).__name__}: {e}")
+                results.append({
+                    "file": str(path),
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}"
+                })
+
+    # Embed and ingest chunks from all files in one pass
+    if pending:
+        print()
         try:
-            result = process_file(
-                path=path,
+            already_ingested = asyncio.run(ingest_to_qdrant(
+                prepared=pending,
                 collection=args.collection,
-                chunk_size=args.chunk_size,
                 qdrant_url=args.qdrant_url,
-                max_file_size=max_file_size
-            )
-            results.append(result)
+                grpc_port=None if args.no_grpc else args.grpc_port
+            ))
         except QdrantConnectionError as e:
-            # Connection errors are fatal - stop processing
+            # Connection errors are fatal
             print(f"\nFatal: {e}")
             sys.exit(1)
-        except FileSizeError as e:
-            # File too large - skip with warning
-            print(f"  Skipped: {e}")
-            results.append({
-                "file": str(path),
-                "status": "skipped",
-                "error": str(e)
-            })
-        except (ExtractorError, IngestError) as e:
-            # Extraction/ingestion errors - log and continue
-            print(f"  Error: {e}")
-            results.append({
-                "file": str(path),
-                "status": "error",
-                "error": str(e)
-            })
         except Exception as e:
-            # Unexpected errors - log with details and continue
-            print(f"  Unexpected error: {type(e).__name__}: {e}")
-            results.append({
-                "file": str(path),
-                "status": "error",
-                "error": f"{type(e).__name__}: {e}"
-            })
+            # Nothing can be reported per file once ingestion is under way
+            print(f"\nFatal: {type(e).__name__}: {e}")
+            sys.exit(1)
+
+        for result in results:
+            if result.get("file_hash") in already_ingested:
+                result["status"] = "unchanged"
+                result["chunks"] = 0
 
     # Summary
     print("\n" + "=" * 50)
     print("Summary:")
     total_chunks = sum(r.get("chunks", 0) for r in results)
     success = sum(1 for r in results if r["status"] == "success")
+    unchanged = sum(1 for r in results if r["status"] == "unchanged")
     skipped = sum(1 for r in results if r["status"] == "skipped")
     errors = sum(1 for r in results if r["status"] == "error")
 
     print(f"  Files processed: {len(results)}")
     print(f"  Successful: {success}")
+    if unchanged:
+        print(f"  Unchanged (already ingested): {unchanged}")
     if skipped:
         print(f"  Skipped (too large): {skipped}")
     print(f"  Errors: {errors}")